@@ -6,16 +6,124 @@ para diferentes fuentes de datos financieros, descargando TODA la información d
 """
 
 from typing import Optional, Union, Dict, Any
+import importlib.util
+import logging
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 import pandas as pd
-import yfinance as yf
 from datetime import datetime, timedelta
+# Filtro instalado una vez al cargar el módulo y acotado por `module=`
+# a yfinance: catch_warnings() por llamada mutaba la lista global de
+# filtros sin protección, y con los handlers corriendo en pools de
+# hilos el save/restore concurrente podía corromperla. Los avisos
+# reales de pandas (SettingWithCopy, etc.) siguen pasando
 import warnings
-warnings.filterwarnings('ignore')
+
+warnings.filterwarnings('ignore', category=FutureWarning, module=r'yfinance(\.|$)')
 
 # Importar funciones de utils
 from python.utils.functions import cache_data
 
 
+def _lazy_import(name: str):
+    """
+    Importar un módulo en diferido (importlib.util.LazyLoader)
+
+    El módulo se registra pero no se ejecuta hasta el primer acceso a
+    un atributo: las rutas que no descargan nada (status, clear-cache,
+    hits de cache) no pagan el import de yfinance y su árbol de
+    dependencias (requests, urllib3...).
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+yf = _lazy_import('yfinance')
+
+# Logger del módulo: el handler bufferiza las escrituras, a diferencia
+# de print() que paga un write() por línea en las rutas cache-hot
+logger = logging.getLogger(__name__)
+
+# Sesión HTTP compartida con cache en disco: las ejecuciones repetidas
+# del ETL reutilizan conexiones keep-alive y las respuestas recientes
+# (1h) se sirven desde sqlite sin tocar la red. OJO: yfinance moderno
+# (curl_cffi) rechaza sesiones con cache — _make_ticker lo detecta en
+# el primer uso y degrada a la sesión interna de yfinance
+try:
+    import requests_cache
+    _session = requests_cache.CachedSession(
+        'data/raw/http_cache', backend='sqlite', expire_after=3600
+    )
+except ImportError:
+    _session = None
+
+
+def _make_ticker(symbol: str):
+    """
+    Construir un yf.Ticker, con la sesión cacheada si yfinance la acepta
+
+    Las versiones recientes de yfinance lanzan YFDataException al
+    recibir una sesión tipo requests_cache; en ese caso se desactiva la
+    sesión compartida para el resto del proceso y se reintenta sin ella.
+    """
+    global _session
+    if _session is not None:
+        try:
+            return yf.Ticker(symbol, session=_session)
+        except Exception as e:
+            logger.warning(f"⚠️ yfinance rechazó la sesión con cache ({e}); continuando sin ella")
+            _session = None
+    return yf.Ticker(symbol)
+
+# Regex de validación de tickers, compilada una sola vez al cargar el
+# módulo en lugar de re-parsearla en cada llamada
+_TICKER_RE = re.compile(r'^[A-Z0-9.\-\^]+$')
+
+# Dtypes reducidos para columnas OHLCV: la precisión de precio cabe de
+# sobra en float32 y Volume en uint32 — la mitad de ancho es la mitad de
+# bytes en cache, serialización y aritmética posterior
+_OHLCV_DTYPES = {
+    'Open': 'float32',
+    'High': 'float32',
+    'Low': 'float32',
+    'Close': 'float32',
+    'Adj Close': 'float32',
+    'Volume': 'uint32',
+}
+
+
+# Universo de secciones de la descarga completa (las claves que
+# activan cada handler de _SECTIONS)
+ALL_SECTIONS = frozenset({
+    'historical', 'key_metrics', 'fundamental_info', 'dividends',
+    'splits', 'balance_sheet', 'income_statement', 'cashflow',
+    'recommendations', 'news', 'options',
+})
+
+# Proyección que consume el ETL de main.py: quien solo necesita estas
+# secciones las pide explícitamente en lugar de materializarlo todo
+DEFAULT_SECTIONS = frozenset({'historical', 'key_metrics', 'dividends'})
+
+def _downcast_ohlcv(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reducir los dtypes OHLCV de un DataFrame de yfinance
+    """
+    dtypes = {col: dtype for col, dtype in _OHLCV_DTYPES.items() if col in data.columns}
+    return data.astype(dtypes, errors='ignore')
+
+
 class ComprehensiveStockDataCollector:
     """
     Colector COMPLETO de datos de acciones con sistema de caché automático
@@ -47,363 +155,649 @@ class ComprehensiveStockDataCollector:
 
         ticker = ticker.strip().upper()
 
+        # Short-circuit barato antes de tocar la regex
         if not ticker or len(ticker) > 10:
             return False
 
-        import re
-        pattern = r'^[A-Z0-9\.\-\^]+$'
-        return bool(re.match(pattern, ticker))
-
-    @cache_data(cache_dir="data/raw")
-    def fetch_complete_stock_data(self, ticker: str, max_period: str = "max") -> Dict[str, Any]:
+        return _TICKER_RE.match(ticker) is not None
+
+    # Tabla declarativa de secciones: (claves que la activan, handler).
+    # Mantenerla en el orden de presentación del payload
+    _SECTIONS = (
+        (('historical',), '_fetch_historical'),
+        (('key_metrics', 'fundamental_info'), '_fetch_fundamental_info'),
+        (('dividends',), '_fetch_dividends'),
+        (('splits',), '_fetch_splits'),
+        (('balance_sheet',), '_fetch_balance_sheet'),
+        (('income_statement',), '_fetch_income_statement'),
+        (('cashflow',), '_fetch_cashflow'),
+        (('recommendations',), '_fetch_recommendations'),
+        (('news',), '_fetch_news'),
+        (('options',), '_fetch_options'),
+    )
+
+    def fetch_complete_stock_data(self, ticker: str, max_period: str = "max",
+                                  sections: Optional[set] = None) -> Dict[str, Any]:
         """
         🚀 DESCARGA COMPLETA DE TODOS LOS DATOS DISPONIBLES
 
+        Por defecto descarga TODAS las secciones; los llamadores que
+        solo consumen un subconjunto (como el ETL de main.py con
+        DEFAULT_SECTIONS) lo piden explícitamente. Las secciones se
+        normalizan a frozenset aquí, antes del cache: None y el set
+        completo explícito comparten la misma clave.
+
         Args:
             ticker: símbolo de la acción
             max_period: período máximo para datos históricos
+            sections: secciones a descargar (por defecto ALL_SECTIONS)
 
         Returns:
-            Dict con TODA la información disponible
+            Dict con la información de las secciones solicitadas
+        """
+        sections = frozenset(sections) if sections is not None else ALL_SECTIONS
+        return self._fetch_complete_data(ticker, max_period, sections)
+
+    @cache_data(cache_dir="data/raw")
+    def _fetch_complete_data(self, ticker: str, max_period: str,
+                             sections: frozenset) -> Dict[str, Any]:
+        """
+        Descarga de las secciones ya normalizadas (detrás del cache)
+
+        Cada sección vive en su propio handler _fetch_*; la tabla
+        _SECTIONS decide cuáles se ejecutan según `sections` y el pool
+        de hilos las resuelve en paralelo (cada handler es I/O
+        independiente bajo yfinance).
         """
         # Validar ticker
         if not self._validate_ticker(ticker):
-            print(f"❌ Ticker inválido: {ticker}")
+            logger.warning(f"❌ Ticker inválido: {ticker}")
             return {}
 
-        print(f"🔍 DESCARGA COMPLETA: {ticker.upper()}")
-        print("=" * 50)
+        logger.info(f"🔍 DESCARGA COMPLETA: {ticker.upper()}")
+        logger.info("=" * 50)
 
         try:
-            stock = yf.Ticker(ticker.upper())
+            stock = _make_ticker(ticker.upper())
             complete_data = {
                 'ticker': ticker.upper(),
                 'download_timestamp': datetime.now().isoformat(),
                 'data_sources': []
             }
 
-            # 1. DATOS HISTÓRICOS (MÚLTIPLES PERÍODOS)
-            print("📈 Descargando datos históricos...")
-            historical_data = {}
+            handlers = []
+            for triggers, handler_name in self._SECTIONS:
+                if sections.intersection(triggers):
+                    handler = getattr(self, handler_name)
+                    if handler_name == '_fetch_historical':
+                        handler = partial(handler, max_period=max_period)
+                    handlers.append((triggers[0], handler))
+
+            if handlers:
+                with ThreadPoolExecutor(max_workers=len(handlers)) as executor:
+                    list(executor.map(
+                        lambda job: self._safe_section(job[0], job[1], stock, complete_data),
+                        handlers
+                    ))
+
+            # Si TODAS las secciones fallaron (p.ej. caída transitoria
+            # de Yahoo) no hay nada que cachear: devolver {} como en el
+            # except general, para no servir el fallo como hit durante
+            # horas
+            if not complete_data['data_sources']:
+                logger.error(f"❌ Ninguna sección disponible para {ticker}")
+                return {}
 
-            periods = ["1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "max"]
-            intervals = ["1d"]  # Puede expandirse a ["1d", "1wk", "1mo"]
+            # RESUMEN FINAL
+            logger.info(f"\n" + "=" * 50)
+            logger.info(f"✅ DESCARGA COMPLETA FINALIZADA")
+            logger.info(f"📊 Fuentes de datos obtenidas: {len(complete_data['data_sources'])}")
+            logger.info(f"📁 Fuentes: {', '.join(complete_data['data_sources'])}")
 
-            for period in periods:
-                for interval in intervals:
-                    try:
-                        data = stock.history(period=period, interval=interval)
-                        if data is not None and not data.empty:
-                            key = f"{period}_{interval}"
-                            historical_data[key] = {
-                                'data': data,
-                                'records': len(data),
-                                'start_date': data.index[0].strftime('%Y-%m-%d'),
-                                'end_date': data.index[-1].strftime('%Y-%m-%d')
-                            }
-                            print(f"  ✅ {key}: {len(data)} registros")
-                    except Exception as e:
-                        print(f"  ❌ Error {period}_{interval}: {e}")
+            return complete_data
 
-            complete_data['historical'] = historical_data
-            complete_data['data_sources'].append('historical_prices')
+        except Exception as e:
+            logger.error(f"❌ Error general descargando {ticker}: {e}")
+            return {}
 
-            # 2. INFORMACIÓN FUNDAMENTAL COMPLETA
-            print("\n🏢 Descargando información fundamental...")
-            try:
-                info = stock.info
-                complete_data['fundamental_info'] = info
-                complete_data['data_sources'].append('fundamental_info')
-
-                # Extraer métricas clave
-                key_metrics = {
-                    'basic_info': {
-                        'symbol': info.get('symbol'),
-                        'longName': info.get('longName'),
-                        'sector': info.get('sector'),
-                        'industry': info.get('industry'),
-                        'country': info.get('country'),
-                        'exchange': info.get('exchange'),
-                        'currency': info.get('currency')
-                    },
-                    'market_data': {
-                        'marketCap': info.get('marketCap'),
-                        'currentPrice': info.get('currentPrice'),
-                        'previousClose': info.get('previousClose'),
-                        'open': info.get('open'),
-                        'dayLow': info.get('dayLow'),
-                        'dayHigh': info.get('dayHigh'),
-                        'volume': info.get('volume'),
-                        'averageVolume': info.get('averageVolume')
-                    },
-                    'valuation': {
-                        'trailingPE': info.get('trailingPE'),
-                        'forwardPE': info.get('forwardPE'),
-                        'priceToBook': info.get('priceToBook'),
-                        'enterpriseValue': info.get('enterpriseValue'),
-                        'priceToSalesTrailing12Months': info.get('priceToSalesTrailing12Months')
-                    },
-                    'financial_health': {
-                        'totalCash': info.get('totalCash'),
-                        'totalDebt': info.get('totalDebt'),
-                        'totalRevenue': info.get('totalRevenue'),
-                        'grossMargins': info.get('grossMargins'),
-                        'operatingMargins': info.get('operatingMargins'),
-                        'profitMargins': info.get('profitMargins')
-                    },
-                    'dividends': {
-                        'dividendYield': info.get('dividendYield'),
-                        'dividendRate': info.get('dividendRate'),
-                        'payoutRatio': info.get('payoutRatio'),
-                        'exDividendDate': info.get('exDividendDate')
-                    }
-                }
-                complete_data['key_metrics'] = key_metrics
-                print(f"  ✅ Información fundamental: {len(info)} campos")
-            except Exception as e:
-                print(f"  ❌ Error info fundamental: {e}")
+    def _safe_section(self, name: str, handler, stock, complete_data: Dict[str, Any]) -> None:
+        """
+        Ejecutar un handler de sección con el try/except centralizado
+        """
+        try:
+            handler(stock, complete_data)
+        except Exception as e:
+            logger.error(f"  ❌ Error {name}: {e}")
 
-            # 3. DIVIDENDOS E HISTORIAL
-            print("\n💰 Descargando historial de dividendos...")
-            try:
-                dividends = stock.dividends
-                if dividends is not None and not dividends.empty:
-                    complete_data['dividends'] = {
-                        'data': dividends,
-                        'total_payments': len(dividends),
-                        'first_dividend': dividends.index[0].strftime('%Y-%m-%d'),
-                        'last_dividend': dividends.index[-1].strftime('%Y-%m-%d'),
-                        'total_amount': dividends.sum(),
-                        'average_dividend': dividends.mean()
-                    }
-                    complete_data['data_sources'].append('dividends')
-                    print(f"  ✅ Dividendos: {len(dividends)} pagos")
-                else:
-                    print(f"  ℹ️ No hay historial de dividendos")
-            except Exception as e:
-                print(f"  ❌ Error dividendos: {e}")
+    def _fetch_historical(self, stock, complete_data: Dict[str, Any], max_period: str = "max") -> None:
+        """
+        Sección 1: datos históricos (múltiples períodos)
+        """
+        logger.info("📈 Descargando datos históricos...")
+        historical_data = {}
+        interval = "1d"  # Puede expandirse a ["1d", "1wk", "1mo"]
+
+        # El período máximo es superconjunto estricto del resto:
+        # una sola petición HTTP y los demás cortes se sintetizan
+        # rebanando el índice (vistas, sin re-descargar nada)
+        period_offsets = {
+            '1mo': pd.DateOffset(months=1),
+            '3mo': pd.DateOffset(months=3),
+            '6mo': pd.DateOffset(months=6),
+            '1y': pd.DateOffset(years=1),
+            '2y': pd.DateOffset(years=2),
+            '5y': pd.DateOffset(years=5),
+            '10y': pd.DateOffset(years=10),
+        }
 
-            # 4. SPLITS DE ACCIONES
-            print("\n📊 Descargando historial de splits...")
-            try:
-                splits = stock.splits
-                if splits is not None and not splits.empty:
-                    complete_data['splits'] = {
-                        'data': splits,
-                        'total_splits': len(splits),
-                        'first_split': splits.index[0].strftime('%Y-%m-%d'),
-                        'last_split': splits.index[-1].strftime('%Y-%m-%d')
+        full_history = stock.history(period=max_period, interval=interval)
+
+        if full_history is not None and not full_history.empty:
+            full_history = _downcast_ohlcv(full_history)
+
+            def _register_period(key, data):
+                if not data.empty:
+                    historical_data[key] = {
+                        'data': data,
+                        'records': len(data),
+                        'start_date': data.index[0].strftime('%Y-%m-%d'),
+                        'end_date': data.index[-1].strftime('%Y-%m-%d')
                     }
-                    complete_data['data_sources'].append('splits')
-                    print(f"  ✅ Splits: {len(splits)} eventos")
-                else:
-                    print(f"  ℹ️ No hay historial de splits")
-            except Exception as e:
-                print(f"  ❌ Error splits: {e}")
+                    logger.info(f"  ✅ {key}: {len(data)} registros")
 
-            # 5. ESTADOS FINANCIEROS
-            print("\n📋 Descargando estados financieros...")
+            _register_period(f"{max_period}_{interval}", full_history)
+            last_bar = full_history.index[-1]
+            for period, offset in period_offsets.items():
+                _register_period(
+                    f"{period}_{interval}",
+                    full_history.loc[full_history.index >= last_bar - offset]
+                )
 
-            # Balance Sheet
-            try:
-                balance_sheet = stock.balance_sheet
-                if balance_sheet is not None and not balance_sheet.empty:
-                    complete_data['balance_sheet'] = balance_sheet
-                    complete_data['data_sources'].append('balance_sheet')
-                    print(f"  ✅ Balance Sheet: {balance_sheet.shape}")
-            except Exception as e:
-                print(f"  ❌ Error Balance Sheet: {e}")
+        complete_data['historical'] = historical_data
+        complete_data['data_sources'].append('historical_prices')
 
-            # Income Statement
-            try:
-                financials = stock.financials
-                if financials is not None and not financials.empty:
-                    complete_data['income_statement'] = financials
-                    complete_data['data_sources'].append('income_statement')
-                    print(f"  ✅ Income Statement: {financials.shape}")
-            except Exception as e:
-                print(f"  ❌ Error Income Statement: {e}")
+    def _fetch_fundamental_info(self, stock, complete_data: Dict[str, Any]) -> None:
+        """
+        Sección 2: información fundamental completa y métricas clave
+        """
+        logger.info("🏢 Descargando información fundamental...")
+        info = stock.info
+        complete_data['fundamental_info'] = info
+        complete_data['data_sources'].append('fundamental_info')
+
+        # Extraer métricas clave
+        key_metrics = {
+            'basic_info': {
+                'symbol': info.get('symbol'),
+                'longName': info.get('longName'),
+                'sector': info.get('sector'),
+                'industry': info.get('industry'),
+                'country': info.get('country'),
+                'exchange': info.get('exchange'),
+                'currency': info.get('currency')
+            },
+            'market_data': {
+                'marketCap': info.get('marketCap'),
+                'currentPrice': info.get('currentPrice'),
+                'previousClose': info.get('previousClose'),
+                'open': info.get('open'),
+                'dayLow': info.get('dayLow'),
+                'dayHigh': info.get('dayHigh'),
+                'volume': info.get('volume'),
+                'averageVolume': info.get('averageVolume')
+            },
+            'valuation': {
+                'trailingPE': info.get('trailingPE'),
+                'forwardPE': info.get('forwardPE'),
+                'priceToBook': info.get('priceToBook'),
+                'enterpriseValue': info.get('enterpriseValue'),
+                'priceToSalesTrailing12Months': info.get('priceToSalesTrailing12Months')
+            },
+            'financial_health': {
+                'totalCash': info.get('totalCash'),
+                'totalDebt': info.get('totalDebt'),
+                'totalRevenue': info.get('totalRevenue'),
+                'grossMargins': info.get('grossMargins'),
+                'operatingMargins': info.get('operatingMargins'),
+                'profitMargins': info.get('profitMargins')
+            },
+            'dividends': {
+                'dividendYield': info.get('dividendYield'),
+                'dividendRate': info.get('dividendRate'),
+                'payoutRatio': info.get('payoutRatio'),
+                'exDividendDate': info.get('exDividendDate')
+            }
+        }
+        complete_data['key_metrics'] = key_metrics
+        logger.info(f"  ✅ Información fundamental: {len(info)} campos")
 
-            # Cash Flow
-            try:
-                cashflow = stock.cashflow
-                if cashflow is not None and not cashflow.empty:
-                    complete_data['cashflow'] = cashflow
-                    complete_data['data_sources'].append('cashflow')
-                    print(f"  ✅ Cash Flow: {cashflow.shape}")
-            except Exception as e:
-                print(f"  ❌ Error Cash Flow: {e}")
+    def _fetch_dividends(self, stock, complete_data: Dict[str, Any]) -> None:
+        """
+        Sección 3: dividendos e historial
+        """
+        logger.info("💰 Descargando historial de dividendos...")
+        dividends = stock.dividends
+        if dividends is not None and not dividends.empty:
+            # sum/mean/count en una sola pasada por la Serie
+            div_stats = dividends.agg(['sum', 'mean', 'count'])
+            total_payments = int(div_stats['count'])
+            complete_data['dividends'] = {
+                'data': dividends,
+                'total_payments': total_payments,
+                'first_dividend': dividends.index[0].strftime('%Y-%m-%d'),
+                'last_dividend': dividends.index[-1].strftime('%Y-%m-%d'),
+                'total_amount': div_stats['sum'],
+                'average_dividend': div_stats['mean']
+            }
+            complete_data['data_sources'].append('dividends')
+            logger.info(f"  ✅ Dividendos: {total_payments} pagos")
+        else:
+            logger.info(f"  ℹ️ No hay historial de dividendos")
 
-            # 6. RECOMENDACIONES DE ANALISTAS
-            print("\n🎯 Descargando recomendaciones...")
-            try:
-                recommendations = stock.recommendations
-                if recommendations is not None and not recommendations.empty:
-                    complete_data['recommendations'] = recommendations
-                    complete_data['data_sources'].append('recommendations')
-                    print(f"  ✅ Recomendaciones: {len(recommendations)} registros")
-                else:
-                    print(f"  ℹ️ No hay recomendaciones disponibles")
-            except Exception as e:
-                print(f"  ❌ Error recomendaciones: {e}")
+    def _fetch_splits(self, stock, complete_data: Dict[str, Any]) -> None:
+        """
+        Sección 4: splits de acciones
+        """
+        logger.info("📊 Descargando historial de splits...")
+        splits = stock.splits
+        if splits is not None and not splits.empty:
+            complete_data['splits'] = {
+                'data': splits,
+                'total_splits': len(splits),
+                'first_split': splits.index[0].strftime('%Y-%m-%d'),
+                'last_split': splits.index[-1].strftime('%Y-%m-%d')
+            }
+            complete_data['data_sources'].append('splits')
+            logger.info(f"  ✅ Splits: {len(splits)} eventos")
+        else:
+            logger.info(f"  ℹ️ No hay historial de splits")
 
-            # 7. NOTICIAS RECIENTES
-            print("\n📰 Descargando noticias...")
-            try:
-                news = stock.news
-                if news:
-                    complete_data['news'] = news
-                    complete_data['data_sources'].append('news')
-                    print(f"  ✅ Noticias: {len(news)} artículos")
-                else:
-                    print(f"  ℹ️ No hay noticias disponibles")
-            except Exception as e:
-                print(f"  ❌ Error noticias: {e}")
+    def _fetch_balance_sheet(self, stock, complete_data: Dict[str, Any]) -> None:
+        """
+        Sección 5a: balance sheet
+        """
+        balance_sheet = stock.balance_sheet
+        if balance_sheet is not None and not balance_sheet.empty:
+            complete_data['balance_sheet'] = balance_sheet
+            complete_data['data_sources'].append('balance_sheet')
+            logger.info(f"  ✅ Balance Sheet: {balance_sheet.shape}")
 
-            # 8. DATOS DE OPCIONES (si están disponibles)
-            print("\n🎲 Descargando datos de opciones...")
-            try:
-                options_dates = stock.options
-                if options_dates:
-                    options_data = {}
-                    # Limitar a las primeras 3 fechas para no sobrecargar
-                    for date in options_dates[:3]:
-                        try:
-                            option_chain = stock.option_chain(date)
-                            options_data[date] = {
-                                'calls': option_chain.calls,
-                                'puts': option_chain.puts
-                            }
-                        except:
-                            pass
-
-                    if options_data:
-                        complete_data['options'] = {
-                            'available_dates': options_dates,
-                            'chains': options_data
-                        }
-                        complete_data['data_sources'].append('options')
-                        print(f"  ✅ Opciones: {len(options_dates)} fechas, {len(options_data)} cadenas descargadas")
-                else:
-                    print(f"  ℹ️ No hay datos de opciones disponibles")
-            except Exception as e:
-                print(f"  ❌ Error opciones: {e}")
+    def _fetch_income_statement(self, stock, complete_data: Dict[str, Any]) -> None:
+        """
+        Sección 5b: income statement
+        """
+        financials = stock.financials
+        if financials is not None and not financials.empty:
+            complete_data['income_statement'] = financials
+            complete_data['data_sources'].append('income_statement')
+            logger.info(f"  ✅ Income Statement: {financials.shape}")
 
-            # RESUMEN FINAL
-            print(f"\n" + "=" * 50)
-            print(f"✅ DESCARGA COMPLETA FINALIZADA")
-            print(f"📊 Fuentes de datos obtenidas: {len(complete_data['data_sources'])}")
-            print(f"📁 Fuentes: {', '.join(complete_data['data_sources'])}")
+    def _fetch_cashflow(self, stock, complete_data: Dict[str, Any]) -> None:
+        """
+        Sección 5c: cash flow
+        """
+        cashflow = stock.cashflow
+        if cashflow is not None and not cashflow.empty:
+            complete_data['cashflow'] = cashflow
+            complete_data['data_sources'].append('cashflow')
+            logger.info(f"  ✅ Cash Flow: {cashflow.shape}")
 
-            return complete_data
+    def _fetch_recommendations(self, stock, complete_data: Dict[str, Any]) -> None:
+        """
+        Sección 6: recomendaciones de analistas
+        """
+        logger.info("🎯 Descargando recomendaciones...")
+        recommendations = stock.recommendations
+        if recommendations is not None and not recommendations.empty:
+            complete_data['recommendations'] = recommendations
+            complete_data['data_sources'].append('recommendations')
+            logger.info(f"  ✅ Recomendaciones: {len(recommendations)} registros")
+        else:
+            logger.info(f"  ℹ️ No hay recomendaciones disponibles")
+
+    def _fetch_news(self, stock, complete_data: Dict[str, Any]) -> None:
+        """
+        Sección 7: noticias recientes
+        """
+        logger.info("📰 Descargando noticias...")
+        news = stock.news
+        if news:
+            complete_data['news'] = news
+            complete_data['data_sources'].append('news')
+            logger.info(f"  ✅ Noticias: {len(news)} artículos")
+        else:
+            logger.info(f"  ℹ️ No hay noticias disponibles")
+
+    def _fetch_options(self, stock, complete_data: Dict[str, Any]) -> None:
+        """
+        Sección 8: datos de opciones (si están disponibles)
+        """
+        logger.info("🎲 Descargando datos de opciones...")
+        options_dates = stock.options
+        if not options_dates:
+            logger.info(f"  ℹ️ No hay datos de opciones disponibles")
+            return
+
+        options_data = {}
+        # Limitar a las primeras 3 fechas para no sobrecargar;
+        # las 3 cadenas se piden en paralelo (I/O independiente)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {
+                executor.submit(stock.option_chain, date): date
+                for date in options_dates[:3]
+            }
+            for future in as_completed(futures):
+                date = futures[future]
+                try:
+                    option_chain = future.result()
+                    options_data[date] = {
+                        'calls': option_chain.calls,
+                        'puts': option_chain.puts
+                    }
+                except:
+                    pass
 
-        except Exception as e:
-            print(f"❌ Error general descargando {ticker}: {e}")
-            return {}
+        if options_data:
+            complete_data['options'] = {
+                'available_dates': options_dates,
+                'chains': options_data
+            }
+            complete_data['data_sources'].append('options')
+            logger.info(f"  ✅ Opciones: {len(options_dates)} fechas, {len(options_data)} cadenas descargadas")
 
-    def fetch_stock_data(self, ticker: str, period: str = "1y", interval: str = "1d") -> Optional[pd.DataFrame]:
+
+    def fetch_stock_data(self, ticker: str, period: str = "1y", interval: str = "1d",
+                         categories: Optional[list] = None) -> Optional[pd.DataFrame]:
         """
         Método simplificado para compatibilidad (descarga solo datos históricos)
         SIN DECORADOR CACHE para evitar conflictos
+
+        Args:
+            categories: universo de categorías para la columna Ticker;
+                        al mezclar frames de varios símbolos (batch +
+                        reintentos) todas deben compartirlo para que un
+                        concat conserve el dtype Categorical
         """
         if not self._validate_ticker(ticker):
-            print(f"❌ Ticker inválido: {ticker}")
+            logger.warning(f"❌ Ticker inválido: {ticker}")
             return None
 
         try:
-            stock = yf.Ticker(ticker.upper())
+            stock = _make_ticker(ticker.upper())
             data = stock.history(period=period, interval=interval)
 
             if data is not None and not data.empty:
-                data = data.dropna()
-                data['Ticker'] = ticker.upper()
-                data['Date'] = data.index
-
-                print(f"✅ Datos obtenidos: {ticker} ({len(data)} registros)")
+                data = _downcast_ohlcv(data.dropna())
+                # Categorical: un solo string en el diccionario en lugar de
+                # repetir el símbolo en cada fila
+                data['Ticker'] = pd.Categorical(
+                    [ticker.upper()] * len(data),
+                    categories=categories if categories is not None else [ticker.upper()]
+                )
+
+                logger.info(f"✅ Datos obtenidos: {ticker} ({len(data)} registros)")
                 return data
             else:
-                print(f"❌ No se encontraron datos para {ticker}")
+                logger.warning(f"❌ No se encontraron datos para {ticker}")
                 return None
 
         except Exception as e:
-            print(f"❌ Error obteniendo datos de {ticker}: {e}")
+            logger.error(f"❌ Error obteniendo datos de {ticker}: {e}")
             return None
 
-    def fetch_multiple_complete(self, tickers: list) -> Dict[str, Dict]:
+    def fetch_multiple_stocks(self, tickers: list, period: str = "1y", interval: str = "1d",
+                              threads: Optional[int] = None) -> Dict[str, pd.DataFrame]:
         """
-        Descarga completa para múltiples tickers
+        Descarga históricos para múltiples tickers en paralelo
+
+        La descarga es I/O-bound (una petición HTTP por símbolo), así que
+        un pool de hilos reduce la latencia total a aproximadamente la del
+        ticker más lento en lugar de la suma de todos.
+
+        Args:
+            tickers: lista de símbolos
+            period: período de datos históricos
+            interval: intervalo de las velas
+            threads: número de hilos (por defecto min(32, len(tickers)))
+
+        Returns:
+            Dict ticker -> DataFrame con los datos obtenidos
         """
         results = {}
 
-        print(f"🚀 DESCARGA MASIVA: {len(tickers)} acciones")
-        print("=" * 60)
+        valid_tickers = []
+        for ticker in tickers:
+            if self._validate_ticker(ticker):
+                valid_tickers.append(ticker)
+            else:
+                logger.warning(f"❌ {ticker} inválido - omitido")
+
+        if not valid_tickers:
+            return results
+
+        # Con varios tickers conviene el endpoint batch de Yahoo: una
+        # sola petición HTTP por cada grupo de ~20 símbolos. Los grupos
+        # que fallen se reintentan abajo ticker a ticker con el pool,
+        # en lugar de perder hasta 20 símbolos en silencio
+        pending = valid_tickers
+        if len(valid_tickers) > 1:
+            results, pending = self._fetch_batched(valid_tickers, period, interval)
+            if not pending:
+                return results
+            logger.warning(f"⚠️ Reintentando {len(pending)} tickers fuera del batch")
+
+        # El mismo universo de categorías que usa la ruta batch: los
+        # frames reintentados se pueden concatenar con los del batch
+        # sin degradar la columna Ticker a object
+        categories = list(dict.fromkeys(t.strip().upper() for t in valid_tickers))
+
+        max_workers = threads or min(32, len(pending))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.fetch_stock_data, ticker, period, interval, categories): ticker
+                for ticker in pending
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    data = future.result()
+                except Exception as e:
+                    logger.error(f"❌ Error obteniendo datos de {ticker}: {e}")
+                    continue
+                if data is not None:
+                    results[ticker] = data
 
-        for i, ticker in enumerate(tickers, 1):
-            print(f"\n[{i}/{len(tickers)}] Procesando {ticker}...")
+        return results
+
+    def fetch_multiple_stocks_batched(self, tickers: list, period: str = "1y",
+                                      interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        """
+        Descarga históricos multi-ticker en modo batch con yf.download
+
+        Yahoo acepta hasta ~20 símbolos por petición, así que se trocea
+        la lista en grupos de 20 y cada grupo se resuelve en una sola
+        llamada HTTP en lugar de una por ticker.
+
+        Args:
+            tickers: lista de símbolos (ya validados)
+            period: período de datos históricos
+            interval: intervalo de las velas
+
+        Returns:
+            Dict ticker -> DataFrame con los datos obtenidos
+        """
+        return self._fetch_batched(tickers, period, interval)[0]
+
+    def _fetch_batched(self, tickers: list, period: str,
+                       interval: str) -> tuple:
+        """
+        Núcleo de la descarga batch: (resultados, tickers fallidos)
+
+        Los tickers de un grupo que falló (o que no se pudieron extraer
+        del batch) se devuelven aparte para que el llamador los
+        reintente por otra vía en lugar de perderlos.
+        """
+        results = {}
+        failed = []
+        chunk_size = 20
+
+        # Todas las categorías conocidas de antemano: un concat posterior
+        # de los resultados conserva la codificación Categorical
+        categories = list(dict.fromkeys(t.strip().upper() for t in tickers))
+
+        for start in range(0, len(tickers), chunk_size):
+            chunk = [t.strip().upper() for t in tickers[start:start + chunk_size]]
+
+            try:
+                batch = yf.download(
+                    tickers=" ".join(chunk),
+                    period=period,
+                    interval=interval,
+                    group_by='ticker',
+                    threads=True,
+                    progress=False
+                )
+            except Exception as e:
+                logger.error(f"❌ Error en descarga batch ({', '.join(chunk)}): {e}")
+                failed.extend(chunk)
+                continue
+
+            if batch is None or batch.empty:
+                logger.warning(f"❌ No se encontraron datos para el grupo {', '.join(chunk)}")
+                failed.extend(chunk)
+                continue
+
+            for ticker in chunk:
+                try:
+                    if isinstance(batch.columns, pd.MultiIndex):
+                        data = batch.xs(ticker, level=0, axis=1).dropna()
+                    else:
+                        # Un solo ticker en el grupo: yf.download no anida columnas
+                        data = batch.dropna()
+
+                    if data.empty:
+                        logger.warning(f"❌ No se encontraron datos para {ticker}")
+                        continue
+
+                    data = _downcast_ohlcv(data.copy())
+                    data['Ticker'] = pd.Categorical([ticker] * len(data), categories=categories)
 
-            if self._validate_ticker(ticker):
-                data = self.fetch_complete_stock_data(ticker)
-                if data:
                     results[ticker] = data
-                    print(f"✅ {ticker} completado")
+                    logger.info(f"✅ Datos obtenidos: {ticker} ({len(data)} registros)")
+                except Exception as e:
+                    logger.error(f"❌ Error procesando {ticker} del batch: {e}")
+                    failed.append(ticker)
+
+        return results, failed
+
+    def fetch_multiple_complete(self, tickers: list, threads: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Descarga completa para múltiples tickers en paralelo
+
+        Args:
+            tickers: lista de símbolos
+            threads: número de hilos (por defecto min(32, len(tickers)))
+        """
+        results = {}
+
+        logger.info(f"🚀 DESCARGA MASIVA: {len(tickers)} acciones")
+        logger.info("=" * 60)
+
+        # Silenciar el logging interno de yfinance durante el batch para
+        # que no domine la salida con cientos de tickers
+        logging.getLogger('yfinance').setLevel(logging.WARNING)
+
+        valid_tickers = []
+        for ticker in tickers:
+            if self._validate_ticker(ticker):
+                valid_tickers.append(ticker)
             else:
-                print(f"❌ {ticker} inválido - omitido")
+                logger.warning(f"❌ {ticker} inválido - omitido")
+
+        if valid_tickers:
+            max_workers = threads or min(32, len(valid_tickers))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self.fetch_complete_stock_data, ticker): ticker
+                    for ticker in valid_tickers
+                }
+                for i, future in enumerate(as_completed(futures), 1):
+                    ticker = futures[future]
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        logger.error(f"❌ [{i}/{len(valid_tickers)}] Error procesando {ticker}: {e}")
+                        continue
+                    if data:
+                        results[ticker] = data
+                        logger.info(f"✅ [{i}/{len(valid_tickers)}] {ticker} completado")
 
-        print(f"\n🎯 RESUMEN MASIVO:")
-        print(f"✅ Acciones procesadas: {len(results)}/{len(tickers)}")
+        logger.info(f"\n🎯 RESUMEN MASIVO:")
+        logger.info(f"✅ Acciones procesadas: {len(results)}/{len(tickers)}")
 
         return results
 
-    def get_cache_status(self) -> dict:
+    def get_cache_status(self, verbose: bool = False) -> dict:
         """
         Obtener estado del sistema de cache
-        """
-        import os
-        import glob
-        from datetime import datetime
-
-        cache_pattern = os.path.join(self.cache_dir, "*.pkl")
-        cache_files = glob.glob(cache_pattern)
 
+        Por defecto solo devuelve los agregados (conteo y tamaño total):
+        con miles de entradas, construir un dict por archivo domina el
+        coste. Con verbose=True se incluye el detalle por archivo.
+        """
         status = {
             'cache_dir': self.cache_dir,
             'cache_exists': os.path.exists(self.cache_dir),
-            'total_files': len(cache_files),
+            'total_files': 0,
+            'total_size_mb': 0.0,
             'files': []
         }
 
-        for cache_file in cache_files:
-            try:
-                stat = os.stat(cache_file)
-                file_info = {
-                    'name': os.path.basename(cache_file),
-                    'size_mb': round(stat.st_size / (1024 * 1024), 2),
-                    'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-                }
-                status['files'].append(file_info)
-            except Exception as e:
-                print(f"❌ Error leyendo archivo {cache_file}: {e}")
-
+        if not status['cache_exists']:
+            return status
+
+        # os.scandir cachea el stat del readdir en cada DirEntry: un
+        # syscall por archivo en lugar de glob + os.stat por separado
+        total_bytes = 0
+        count = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(('.pkl', '.parquet', '.feather', '.json')):
+                    continue
+                try:
+                    stat = entry.stat()
+                except Exception as e:
+                    logger.error(f"❌ Error leyendo archivo {entry.path}: {e}")
+                    continue
+                total_bytes += stat.st_size
+                count += 1
+                if verbose:
+                    status['files'].append({
+                        'name': entry.name,
+                        'size_mb': round(stat.st_size / (1024 * 1024), 2),
+                        'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+                    })
+
+        status['total_files'] = count
+        status['total_size_mb'] = round(total_bytes / (1024 * 1024), 2)
         return status
 
     def clear_cache(self) -> None:
         """
         Limpiar archivos de cache del directorio
         """
-        import os
-        import glob
-
-        cache_pattern = os.path.join(self.cache_dir, "*.pkl")
-        cache_files = glob.glob(cache_pattern)
-
-        for cache_file in cache_files:
-            try:
-                os.remove(cache_file)
-                print(f"🗑️ Cache eliminado: {os.path.basename(cache_file)}")
-            except Exception as e:
-                print(f"❌ Error eliminando cache {cache_file}: {e}")
+        if os.path.exists(self.cache_dir):
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(('.pkl', '.parquet', '.feather', '.json')):
+                        continue
+                    try:
+                        os.unlink(entry.path)
+                        logger.info(f"🗑️ Cache eliminado: {entry.name}")
+                    except Exception as e:
+                        logger.error(f"❌ Error eliminando cache {entry.path}: {e}")
 
-        print(f"✅ Limpieza de cache completada")
+        logger.info(f"✅ Limpieza de cache completada")
 
 
 # Instancia global para uso fácil - NUEVA CLASE COMPLETA
@@ -4,7 +4,10 @@ Angband Trading - ETL Principal
 ETL sencilla: Extract (descargar), Transform (procesar), Load (guardar)
 """
 
+import logging
+import sys
 import time
+import traceback
 from datetime import datetime
 
 
@@ -16,12 +19,12 @@ def extract_data(ticker: str = "AAPL"):
     print("-" * 50)
 
     try:
-        from python.data.collectors import stock_collector
+        from python.data.collectors import stock_collector, DEFAULT_SECTIONS
 
         start_time = time.time()
 
-        # Descarga completa de todos los datos
-        complete_data = stock_collector.fetch_complete_stock_data(ticker)
+        # Descarga solo las secciones que transform_data consume
+        complete_data = stock_collector.fetch_complete_stock_data(ticker, sections=DEFAULT_SECTIONS)
 
         extract_time = time.time() - start_time
 
@@ -69,7 +72,10 @@ def transform_data(raw_data):
                     break
 
             if main_data is not None:
-                # Calcular métricas básicas
+                # Calcular métricas básicas: los tres escaneos de columna
+                # (max/min/mean) en un solo agg; los extremos de Close son
+                # accesos posicionales O(1), no recorridos
+                stats = main_data.agg({'High': 'max', 'Low': 'min', 'Volume': 'mean'})
                 latest_price = main_data['Close'].iloc[-1]
                 first_price = main_data['Close'].iloc[0]
                 total_return = ((latest_price - first_price) / first_price) * 100
@@ -77,11 +83,11 @@ def transform_data(raw_data):
                 transformed['summary']['price_data'] = {
                     'current_price': round(latest_price, 2),
                     'first_price': round(first_price, 2),
-                    'max_price': round(main_data['High'].max(), 2),
-                    'min_price': round(main_data['Low'].min(), 2),
+                    'max_price': round(stats['High'], 2),
+                    'min_price': round(stats['Low'], 2),
                     'total_return_pct': round(total_return, 2),
-                    'avg_volume': int(main_data['Volume'].mean()),
-                    'total_records': len(main_data)
+                    'avg_volume': int(stats['Volume']),
+                    'total_records': len(main_data.index)
                 }
                 print(f"  ✅ Datos históricos procesados: {len(main_data)} registros")
 
@@ -133,58 +139,59 @@ def load_summary(processed_data):
         ticker = processed_data.get('ticker', 'UNKNOWN')
         summary = processed_data.get('summary', {})
 
-        print(f"\n🏢 EMPRESA: {ticker}")
-        print("=" * 30)
+        # Acumular el resumen y emitirlo en una sola escritura: un
+        # write() en lugar de ~20 syscalls de print por línea
+        lines = [f"\n🏢 EMPRESA: {ticker}", "=" * 30]
 
         # Información de la empresa
         if 'company_info' in summary:
             company = summary['company_info']
-            print(f"📋 Nombre: {company.get('name', 'N/A')}")
-            print(f"🏭 Sector: {company.get('sector', 'N/A')}")
-            print(f"🔧 Industria: {company.get('industry', 'N/A')}")
+            lines.append(f"📋 Nombre: {company.get('name', 'N/A')}")
+            lines.append(f"🏭 Sector: {company.get('sector', 'N/A')}")
+            lines.append(f"🔧 Industria: {company.get('industry', 'N/A')}")
 
             market_cap = company.get('market_cap')
             if market_cap and market_cap > 0:
                 market_cap_b = market_cap / 1e9
-                print(f"💰 Capitalización: ${market_cap_b:.1f}B")
+                lines.append(f"💰 Capitalización: ${market_cap_b:.1f}B")
 
         # Datos de precios
         if 'price_data' in summary:
             prices = summary['price_data']
-            print(f"\n📊 DATOS DE PRECIOS:")
-            print(f"💵 Precio actual: ${prices.get('current_price', 'N/A')}")
-            print(f"📈 Máximo histórico: ${prices.get('max_price', 'N/A')}")
-            print(f"📉 Mínimo histórico: ${prices.get('min_price', 'N/A')}")
-            print(f"🎯 Retorno total: {prices.get('total_return_pct', 'N/A')}%")
-            print(f"📊 Volumen promedio: {prices.get('avg_volume', 'N/A'):,}")
-            print(f"📅 Registros históricos: {prices.get('total_records', 'N/A'):,}")
-            print(f"📆 Período: {prices.get('date_range', 'N/A')}")
+            lines.append(f"\n📊 DATOS DE PRECIOS:")
+            lines.append(f"💵 Precio actual: ${prices.get('current_price', 'N/A')}")
+            lines.append(f"📈 Máximo histórico: ${prices.get('max_price', 'N/A')}")
+            lines.append(f"📉 Mínimo histórico: ${prices.get('min_price', 'N/A')}")
+            lines.append(f"🎯 Retorno total: {prices.get('total_return_pct', 'N/A')}%")
+            lines.append(f"📊 Volumen promedio: {prices.get('avg_volume', 'N/A'):,}")
+            lines.append(f"📅 Registros históricos: {prices.get('total_records', 'N/A'):,}")
+            lines.append(f"📆 Período: {prices.get('date_range', 'N/A')}")
 
             # Mostrar el período de datos usado
             data_period = summary.get('data_period', 'N/A')
-            print(f"⏰ Período usado: {data_period}")
+            lines.append(f"⏰ Período usado: {data_period}")
 
         # Dividendos
         if 'dividends' in summary:
             div = summary['dividends']
-            print(f"\n💰 DIVIDENDOS:")
-            print(f"💸 Total pagos: {div.get('total_payments', 0)}")
-            print(f"💵 Monto total: ${div.get('total_amount', 0)}")
-            print(f"📊 Promedio por pago: ${div.get('avg_dividend', 0)}")
+            lines.append(f"\n💰 DIVIDENDOS:")
+            lines.append(f"💸 Total pagos: {div.get('total_payments', 0)}")
+            lines.append(f"💵 Monto total: ${div.get('total_amount', 0)}")
+            lines.append(f"📊 Promedio por pago: ${div.get('avg_dividend', 0)}")
         else:
-            print(f"\n💰 DIVIDENDOS: Sin historial de dividendos")
+            lines.append(f"\n💰 DIVIDENDOS: Sin historial de dividendos")
 
         # Splits
         if 'splits' in summary:
             splits = summary['splits']
-            print(f"\n📊 SPLITS: {splits.get('total_splits', 0)} eventos de división")
+            lines.append(f"\n📊 SPLITS: {splits.get('total_splits', 0)} eventos de división")
 
-        print(f"\n✅ Resumen generado exitosamente")
+        lines.append(f"\n✅ Resumen generado exitosamente")
+        sys.stdout.write("\n".join(lines) + "\n")
         return True
 
     except Exception as e:
         print(f"❌ Error en Load: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -222,5 +229,31 @@ def run_etl(ticker: str = "AAPL"):
 
 
 if __name__ == "__main__":
-    # Ejecutar ETL para AAPL
-    run_etl("AAPL")
\ No newline at end of file
+    import argparse
+
+    # Sin esto el root logger queda en WARNING sin handler y toda la
+    # telemetría de los colectores (incluidos los errores de descarga)
+    # se descarta en silencio
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    # Subcomandos: las rutas de solo-cache (status, clear-cache) no
+    # tocan yfinance, que queda diferido hasta la primera descarga real
+    parser = argparse.ArgumentParser(description="Angband Trading - ETL Pipeline")
+    subparsers = parser.add_subparsers(dest="command")
+    etl_parser = subparsers.add_parser("etl", help="Ejecutar el proceso ETL completo")
+    etl_parser.add_argument("ticker", nargs="?", default="AAPL", help="Símbolo a procesar")
+    subparsers.add_parser("status", help="Mostrar estado del cache")
+    subparsers.add_parser("clear-cache", help="Eliminar archivos de cache")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        from python.data.collectors import stock_collector
+        status = stock_collector.get_cache_status()
+        print(f"📦 Cache: {status['total_files']} archivos, "
+              f"{status['total_size_mb']} MB en {status['cache_dir']}")
+    elif args.command == "clear-cache":
+        from python.data.collectors import stock_collector
+        stock_collector.clear_cache()
+    else:
+        # Sin subcomando se mantiene el comportamiento de siempre
+        run_etl(args.ticker if args.command == "etl" else "AAPL")
\ No newline at end of file
@@ -4,80 +4,686 @@ Utility Functions - Funciones auxiliares reutilizables
 Funciones básicas y decoradores para el sistema de trading.
 """
 
+import collections
+import hashlib
+import io
+import json
+import mmap
+import os
 import pickle
-from datetime import date
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from functools import wraps
+from functools import lru_cache, wraps
+import numpy as np
 import pandas as pd
+from pandas.util import hash_pandas_object
+import pyarrow as pa
+from pyarrow import feather
+
+# Compresión zstd opcional para los blobs pickle; sin ella se escribe
+# pickle plano y los archivos comprimidos existentes siguen siendo
+# detectables por su magic
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# orjson opcional para los esqueletos JSON: serializa y parsea a
+# velocidad C (3-10x sobre el json de la stdlib) y entiende los tipos
+# NumPy de forma nativa; sin él se usa json con el default de siempre
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Magic de un stream zstd (RFC 8878)
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Magic del formato pickle con frames: esqueleto pickle + buffers
+# NumPy out-of-band (PEP 574), cada uno precedido por su longitud
+_FRAME_MAGIC = b'ANGF'
+
+# Cabecera de integridad de los archivos pickle:
+# magic(4) + checksum(8) + longitud del payload(8)
+_CACHE_MAGIC = b'ANGB'
+_HEADER_LEN = 20
+
+# xxhash opcional (~20 GB/s); blake2b truncado como fallback stdlib
+try:
+    import xxhash
+
+    def _checksum(buf) -> bytes:
+        return xxhash.xxh3_64(buf).digest()
+except ImportError:
+    def _checksum(buf) -> bytes:
+        return hashlib.blake2b(buf, digest_size=8).digest()
+
+
+# Tope del nivel de cache en memoria (bytes); configurable por entorno
+_MEM_MAX_BYTES = int(os.environ.get('ANGBAND_CACHE_MEM_BYTES', 1 << 30))
+
+# Tope del cache en disco (bytes); configurable por entorno
+_DISK_MAX_BYTES = int(os.environ.get('ANGBAND_CACHE_MAX_BYTES', 5 << 30))
+
+# Serializa la evicción entre hilos de este proceso; entre procesos la
+# evicción es best-effort (unlink perdido = ya lo borró otro)
+_evict_lock = threading.Lock()
+
+# Sufijo de fecha del esquema de claves antiguo (ticker_periodo_fecha)
+_LEGACY_DATE_SUFFIX = re.compile(r'_\d{4}-\d{2}-\d{2}(__|\.)')
+
+
+# Resultado memoizado de _cache_max_age: la política solo depende del
+# día de la semana y la hora UTC, así que se recalcula al cambiar de
+# hora en lugar de construir un datetime por cada clave consultada
+_AGE_CACHE = {'bucket': None, 'age': 24 * 3600}
+
+
+def _cache_max_age() -> float:
+    """
+    Edad máxima (segundos) de una entrada de cache antes de re-descargar
+
+    En fin de semana no hay barras nuevas, así que las entradas duran
+    hasta 72h; entre semana se refresca cada 6h en horario aproximado
+    de mercado US (UTC) y cada 24h fuera de él. Esto evita el pico de
+    cache frío de medianoche que causaba la clave con fecha.
+    """
+    bucket = int(time.time() // 3600)
+    if _AGE_CACHE['bucket'] != bucket:
+        now = datetime.now(timezone.utc)
+        if now.weekday() >= 5:  # sábado / domingo
+            age = 72 * 3600
+        elif 13 <= now.hour < 22:  # ~sesión US en UTC
+            age = 6 * 3600
+        else:
+            age = 24 * 3600
+        _AGE_CACHE['bucket'] = bucket
+        _AGE_CACHE['age'] = age
+    return _AGE_CACHE['age']
+
+
+def _sweep_legacy_cache(cache_path: Path) -> None:
+    """
+    Barrido de arranque: eliminar archivos del esquema con fecha
+    """
+    try:
+        with os.scandir(cache_path) as it:
+            for entry in it:
+                if (entry.name.endswith(('.pkl', '.parquet', '.feather', '.json'))
+                        and _LEGACY_DATE_SUFFIX.search(entry.name)):
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+    except OSError:
+        pass
+
+
+def _evict_if_needed(cache_path: Path, max_bytes: int = None) -> None:
+    """
+    Mantener el cache en disco por debajo de un tope de bytes
+
+    LRU por tiempo de acceso: se ordena por st_atime (st_mtime si el
+    filesystem monta noatime) y se borran los más viejos hasta volver
+    bajo el límite. Un esqueleto JSON y sus sidecars clave__campo.feather
+    forman UNA entrada: se desalojan juntos, nunca un sidecar suelto
+    cuyo esqueleto siga sirviéndose como hit. Best-effort: un unlink
+    que falla se ignora — en paralelo otro proceso pudo haberlo
+    borrado ya.
+    """
+    if max_bytes is None:
+        max_bytes = _DISK_MAX_BYTES
+
+    with _evict_lock:
+        # Agrupar por clave de cache: el dueño de un sidecar
+        # clave__campo.feather es "clave" (la convención de
+        # _externalize_dataframes)
+        groups = {}
+        total = 0
+        try:
+            with os.scandir(cache_path) as it:
+                for entry in it:
+                    if not entry.name.endswith(('.pkl', '.parquet', '.feather', '.json')):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    stem = entry.name.rsplit('.', 1)[0]
+                    owner = stem.split('__', 1)[0]
+                    group = groups.setdefault(owner, [0.0, 0, []])
+                    group[0] = max(group[0], stat.st_atime or stat.st_mtime)
+                    group[1] += stat.st_size
+                    group[2].append((entry.path, stat.st_size))
+                    total += stat.st_size
+        except OSError:
+            return
+
+        if total <= max_bytes:
+            return
+
+        for atime, size, paths in sorted(groups.values()):
+            for path, file_size in paths:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                total -= file_size
+            if total <= max_bytes:
+                break
+
+
+def _result_nbytes(value) -> int:
+    """
+    Estimar los bytes residentes de un resultado cacheado
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sum(_result_nbytes(sub_value) for sub_value in value.values())
+    return sys.getsizeof(value)
+
+
+def _dumps_json(obj) -> bytes:
+    """
+    Serializar el esqueleto JSON a bytes (orjson si está disponible)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY,
+                            default=_json_default)
+    return json.dumps(obj, default=_json_default).encode('utf-8')
+
+
+def _loads_json(path: Path):
+    """
+    Parsear un esqueleto JSON desde disco (orjson si está disponible)
+    """
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_default(obj):
+    """
+    Serializar a JSON los escalares numpy/pandas del esqueleto
+    """
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
+
+
+def _key_token(value) -> str:
+    """
+    Convertir un argumento de cache en un token corto y estable
+
+    Los escalares usan su str(). Un DataFrame se resume con
+    hash_pandas_object (hash vectorizado en C sobre filas e índice) más
+    blake2b, en lugar de picklear el frame entero solo para derivar
+    ~16 bytes de clave.
+    """
+    if isinstance(value, pd.DataFrame):
+        h = hashlib.blake2b(digest_size=16)
+        h.update(hash_pandas_object(value, index=True).values.tobytes())
+        h.update(str(value.shape).encode())
+        return h.hexdigest()
+    return str(value)
+
+
+def _shrink(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compactar dtypes de un DataFrame antes de escribirlo a disco
+
+    Red de seguridad en la capa de cache: aunque los collectors ya
+    reducen OHLCV, cualquier frame que llegue con float64/int64
+    innecesarios se compacta aquí — la mitad de bytes en disco es la
+    mitad de bytes en cada recarga. Para barras diarias sin zona
+    horaria el índice datetime[ns] baja a resolución de segundos.
+    """
+    df = df.copy()
+
+    for col in ("Open", "High", "Low", "Close", "Adj Close"):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast='float')
+    if "Volume" in df.columns:
+        df["Volume"] = pd.to_numeric(df["Volume"], downcast='unsigned')
+
+    if isinstance(df.index, pd.DatetimeIndex) and df.index.tz is None:
+        try:
+            df.index = df.index.astype('datetime64[s]')
+        except (TypeError, ValueError):
+            pass
+
+    return df
+
+
+def _replace_atomic(tmp: Path, path: Path) -> None:
+    """
+    Publicar un archivo de cache con os.replace (rename atómico):
+    un lector concurrente o un crash nunca ve un archivo truncado
+    """
+    os.replace(tmp, path)
+
+
+def _write_feather(df: pd.DataFrame, path: Path) -> None:
+    """
+    Guardar un DataFrame en Feather v2 (Arrow IPC) con compresión lz4
+    """
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    table = pa.Table.from_pandas(df)
+    feather.write_feather(table, str(tmp), compression='lz4')
+    _replace_atomic(tmp, path)
+
+
+def _write_frames(f, data: bytes, buffers: list) -> None:
+    """
+    Volcar el esqueleto pickle y sus buffers con cabeceras de longitud
+    """
+    f.write(_FRAME_MAGIC)
+    f.write(len(buffers).to_bytes(8, 'little'))
+    f.write(len(data).to_bytes(8, 'little'))
+    f.write(data)
+    for buf in buffers:
+        raw = buf.raw()
+        f.write(raw.nbytes.to_bytes(8, 'little'))
+        f.write(raw)
+
+
+def _dump_pickle(obj, path: Path) -> None:
+    """
+    Escritura atómica de pickle comprimido con zstd
+
+    Protocolo 5 con buffer_callback (PEP 574): los arrays NumPy salen
+    como buffers out-of-band escritos directamente al archivo en lugar
+    de copiarse byte a byte dentro del stream pickle — una memcpy menos
+    por columna. zstd nivel 3 comprime ~3x a cientos de MB/s, coste
+    despreciable frente al disco.
+    """
+    buffers = []
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL,
+                        buffer_callback=buffers.append)
+    body = io.BytesIO()
+    _write_frames(body, data, buffers)
+    payload = body.getvalue()
+    if zstandard is not None:
+        payload = zstandard.ZstdCompressor(level=3).compress(payload)
+
+    # Cabecera de integridad: en lectura el checksum se verifica ANTES
+    # de deserializar, así la corrupción se detecta sin gastar CPU ni
+    # memoria en objetos a medio construir
+    header = _CACHE_MAGIC + _checksum(payload) + len(payload).to_bytes(8, 'little')
+
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+    _replace_atomic(tmp, path)
+
+
+def _loads_payload(view):
+    """
+    Deserializar un payload pickle (zstd y/o frames PEP 574 opcionales)
+    """
+    if view[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError("cache comprimida con zstd pero zstandard no está instalado")
+        # decompressobj no exige que el frame declare su tamaño final
+        blob = zstandard.ZstdDecompressor().decompressobj().decompress(view)
+        view = memoryview(blob)
+
+    if view[:4] != _FRAME_MAGIC:
+        return pickle.loads(view)
+
+    nbuf = int.from_bytes(view[4:12], 'little')
+    offset = 12
+    data_len = int.from_bytes(view[offset:offset + 8], 'little')
+    offset += 8
+    data = view[offset:offset + data_len]
+    offset += data_len
+    buffers = []
+    for _ in range(nbuf):
+        buf_len = int.from_bytes(view[offset:offset + 8], 'little')
+        offset += 8
+        # bytearray: los arrays reconstruidos necesitan un buffer
+        # escribible; una memoryview de solo lectura no sirve
+        buffers.append(bytearray(view[offset:offset + buf_len]))
+        offset += buf_len
+    return pickle.loads(data, buffers=buffers)
+
+
+def _load_pickle(path: Path):
+    """
+    Leer un pickle verificando primero la cabecera de integridad
+
+    El archivo se mapea con mmap (el payload llega a pickle sin pasar
+    por un read() intermedio) y el checksum se comprueba antes de
+    deserializar: un archivo corrupto es un ValueError inmediato, que
+    el wrapper trata como cache-miss. Los formatos anteriores sin
+    cabecera siguen cargando.
+    """
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                if view[:4] == _CACHE_MAGIC:
+                    payload_len = int.from_bytes(view[12:20], 'little')
+                    payload = view[_HEADER_LEN:_HEADER_LEN + payload_len]
+                    try:
+                        if payload.nbytes != payload_len or _checksum(payload) != bytes(view[4:12]):
+                            raise ValueError(f"checksum de cache no coincide: {path.name}")
+                        return _loads_payload(payload)
+                    finally:
+                        payload.release()
+                return _loads_payload(view)
+            finally:
+                view.release()
+
+
+@lru_cache(maxsize=32)
+def _read_feather_cached(path_str: str, mtime_ns: int) -> pd.DataFrame:
+    """
+    Leer un DataFrame Feather vía memory-map (lectura zero-copy)
+
+    El mmap evita la copia de read(); to_pandas con self_destruct libera
+    los buffers Arrow según se van convirtiendo a columnas pandas. El
+    lru_cache memoiza por (ruta, mtime): lecturas repetidas del mismo
+    archivo dentro del proceso ni siquiera tocan el disco, y un archivo
+    reescrito invalida la entrada porque cambia su mtime.
+    """
+    with pa.memory_map(path_str) as source:
+        table = feather.read_table(source)
+        return table.to_pandas(zero_copy_only=False, self_destruct=True)
+
+
+def _read_feather(path: Path) -> pd.DataFrame:
+    """
+    Leer un Feather con memoización por ruta+mtime
+    """
+    return _read_feather_cached(str(path), path.stat().st_mtime_ns)
+
+
+def _externalize_dataframes(value, cache_path: Path, cache_key: str, field: str = ""):
+    """
+    Sustituir DataFrames/Series anidados por sidecars Feather
+
+    Recorre el dict una sola vez; cada DataFrame (o Series, convertida a
+    frame de una columna) se escribe a su propio archivo .feather y en
+    el esqueleto queda un marcador con el nombre del sidecar. El resto
+    de valores queda como escalares JSON.
+    """
+    if isinstance(value, pd.DataFrame):
+        sidecar = f"{cache_key}__{field}.feather"
+        _write_feather(value, cache_path / sidecar)
+        return {'__feather__': sidecar}
+
+    if isinstance(value, pd.Series):
+        sidecar = f"{cache_key}__{field}.feather"
+        _write_feather(value.to_frame(), cache_path / sidecar)
+        return {'__feather_series__': sidecar}
+
+    if isinstance(value, dict):
+        return {
+            key: _externalize_dataframes(
+                sub_value, cache_path, cache_key,
+                f"{field}.{key}" if field else str(key)
+            )
+            for key, sub_value in value.items()
+        }
+
+    return value
+
+
+def _materialize(value, cache_path: Path):
+    """
+    Resolver un valor del esqueleto: sidecar -> DataFrame/Series,
+    dict anidado -> proxy perezoso, escalar -> tal cual
+    """
+    if isinstance(value, dict):
+        if '__feather__' in value and len(value) == 1:
+            return _read_feather(cache_path / value['__feather__'])
+        if '__feather_series__' in value and len(value) == 1:
+            return _read_feather(cache_path / value['__feather_series__']).iloc[:, 0]
+        return LazyCacheDict(value, cache_path)
+
+    return value
+
+
+class LazyCacheDict(dict):
+    """
+    Dict de cache que materializa los sidecars Feather bajo demanda
+
+    El esqueleto JSON se carga entero (los escalares son un parse O(1));
+    cada DataFrame solo se lee de disco la primera vez que alguien
+    accede a su clave, y queda memoizado en el propio dict.
+
+    OJO: solo los accesos por clave (__getitem__/get) y los recorridos
+    values()/items() materializan. Las rutas que comparan o copian el
+    dict crudo (==, dict(d), copy()) ven los marcadores {'__feather__'}
+    de los sidecars aún no leídos, no DataFrames.
+    """
+
+    def __init__(self, skeleton: dict, cache_path: Path):
+        super().__init__(skeleton)
+        self._cache_path = cache_path
+
+    def __getitem__(self, key):
+        value = _materialize(super().__getitem__(key), self._cache_path)
+        super().__setitem__(key, value)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def values(self):
+        # Materializar vía self[k]: un values() del dict base filtraría
+        # los marcadores de sidecars sin leer
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+
+def _rehydrate_dataframes(value, cache_path: Path):
+    """
+    Reconstruir (perezosamente) los DataFrames desde sus sidecars
+    """
+    return _materialize(value, cache_path)
+
+
+def _write_cache(cache_path: Path, cache_key: str, result) -> None:
+    """
+    Escribir una entrada de cache a disco en el formato que le toca
+
+    DataFrame -> Feather v2; dict -> sidecars Feather + esqueleto JSON;
+    resto -> pickle. Solo lo llama el wrapper de cache_data: sembrar
+    entradas desde fuera del decorador exige reproducir exactamente su
+    esquema de claves (función + args) o se sirven payloads del tipo
+    equivocado como hits.
+    """
+    if isinstance(result, pd.DataFrame):
+        _write_feather(_shrink(result), cache_path / f"{cache_key}.feather")
+    elif isinstance(result, dict):
+        json_file = cache_path / f"{cache_key}.json"
+        skeleton = _externalize_dataframes(result, cache_path, cache_key)
+        tmp_json = json_file.with_suffix(json_file.suffix + '.tmp')
+        with open(tmp_json, 'wb') as f:
+            f.write(_dumps_json(skeleton))
+        _replace_atomic(tmp_json, json_file)
+    else:
+        _dump_pickle(result, cache_path / f"{cache_key}.pkl")
 
 
 def cache_data(cache_dir: str = "data/raw"):
     """
-    Decorador mejorado para cachear datos usando pickle
+    Decorador mejorado para cachear datos financieros
 
-    Genera archivo: ticker_periodo_fecha.pkl
+    Genera archivo: funcion_ticker_periodo
     Primera vez: ejecuta función y guarda
-    Siguientes veces: carga desde pickle
+    Siguientes veces: carga desde disco mientras la entrada sea fresca
+    (la frescura depende del calendario: ver _cache_max_age)
 
-    MANEJA TANTO DataFrames COMO diccionarios
+    Los DataFrames se guardan en Feather v2 (Arrow IPC), que permite
+    recargas memory-mapped casi a velocidad de memcpy; los dicts con
+    DataFrames anidados (complete_data) se descomponen en sidecars
+    .feather más un esqueleto JSON que se recarga como dict perezoso:
+    cada sidecar solo se lee si alguien accede a su clave. El resto de
+    payloads mantiene el fallback pickle.
 
     Args:
         cache_dir: directorio donde guardar cache
     """
 
     def decorator(func):
+        # Nivel en memoria por encima del disco: repetir una petición en
+        # el mismo proceso es un lookup de dict, no un read+deserialize.
+        # LRU acotado por bytes, con el total llevado incrementalmente
+        _mem = collections.OrderedDict()
+        _mem_total = [0]
+        _mem_lock = threading.Lock()
+        _key_locks = collections.defaultdict(threading.Lock)
+
+        def _mem_put(key, value, stored_at=None):
+            # stored_at: al promover un hit de disco se hereda el mtime
+            # del archivo, para que ambos niveles caduquen a la vez en
+            # lugar de regalarle a la entrada una segunda vida en RAM
+            size = _result_nbytes(value)
+            with _mem_lock:
+                if key in _mem:
+                    _mem_total[0] -= _mem.pop(key)[1]
+                _mem[key] = (value, size, stored_at if stored_at is not None else time.time())
+                _mem_total[0] += size
+                while _mem and _mem_total[0] > _MEM_MAX_BYTES:
+                    _, (_, evicted_size, _) = _mem.popitem(last=False)
+                    _mem_total[0] -= evicted_size
+
+        # Directorio creado una sola vez por proceso: el mkdir por
+        # llamada era un stat(2) redundante en cada invocación
+        cache_path = Path(cache_dir)
+        cache_path.mkdir(parents=True, exist_ok=True)
+
+        # Barrido único al decorar: limpiar claves del esquema con fecha
+        _sweep_legacy_cache(cache_path)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Extraer parámetros básicos (ticker, period)
             ticker = args[1] if len(args) > 1 else kwargs.get('ticker', 'DATA')
             period = args[2] if len(args) > 2 else kwargs.get('period', '1y')
 
-            # Crear clave: ticker_periodo_fecha
-            today = date.today().strftime('%Y-%m-%d')
-            cache_key = f"{ticker}_{period}_{today}"
+            # Crear clave: funcion_ticker_periodo. El nombre de la
+            # función la separa en su propio espacio (dos funciones
+            # decoradas con los mismos args no comparten entrada); la
+            # frescura la decide la edad del archivo (mtime), no una
+            # fecha embebida en la clave
+            cache_key = f"{func.__name__}_{_key_token(ticker)}_{_key_token(period)}"
 
-            # Crear directorio y archivo
-            cache_path = Path(cache_dir)
-            cache_path.mkdir(parents=True, exist_ok=True)
-            cache_file = cache_path / f"{cache_key}.pkl"
+            # Las secciones solicitadas forman parte de la clave: un hit
+            # parcial de otra petición no debe servirse como completo
+            sections = args[3] if len(args) > 3 else kwargs.get('sections')
+            if sections:
+                cache_key += "_" + "-".join(sorted(sections))
 
-            # Cargar desde cache si existe
-            if cache_file.exists():
-                print(f"📦 Cache: {cache_key}")
-                try:
-                    with open(cache_file, 'rb') as f:
-                        return pickle.load(f)
-                except Exception as e:
-                    print(f"⚠️ Error cargando cache, descargando nuevamente: {e}")
-
-            # Ejecutar función y guardar
-            print(f"🌐 Descarga: {cache_key}")
-            result = func(*args, **kwargs)
-
-            # Guardar si hay datos válidos
-            should_cache = False
-
-            if result is not None:
-                # Verificar si es DataFrame
-                if isinstance(result, pd.DataFrame):
-                    should_cache = not result.empty
-                # Verificar si es diccionario
+            # Serializar por clave: dos hilos pidiendo el mismo ticker no
+            # deben descargarlo ni escribir su archivo dos veces; claves
+            # distintas siguen avanzando en paralelo
+            with _mem_lock:
+                key_lock = _key_locks[cache_key]
+
+            with key_lock:
+                max_age = _cache_max_age()
+
+                # Nivel 1: memoria del proceso
+                if cache_key in _mem:
+                    value, size, stored_at = _mem[cache_key]
+                    if time.time() - stored_at <= max_age:
+                        _mem.move_to_end(cache_key)
+                        return value
+                    _mem_total[0] -= size
+                    del _mem[cache_key]
+
+                # Archivos candidatos (el directorio ya existe)
+                feather_file = cache_path / f"{cache_key}.feather"
+                json_file = cache_path / f"{cache_key}.json"
+                pickle_file = cache_path / f"{cache_key}.pkl"
+
+                def _fresh(cache_file):
+                    return (time.time() - cache_file.stat().st_mtime) <= max_age
+
+                # Nivel 2: disco (Feather, luego JSON, luego pickle); una
+                # entrada más vieja que max_age se trata como miss
+                if feather_file.exists() and _fresh(feather_file):
+                    print(f"📦 Cache: {cache_key}")
+                    try:
+                        loaded = _read_feather(feather_file)
+                        _mem_put(cache_key, loaded, stored_at=feather_file.stat().st_mtime)
+                        return loaded
+                    except Exception as e:
+                        print(f"⚠️ Error cargando cache, descargando nuevamente: {e}")
+                elif json_file.exists() and _fresh(json_file):
+                    print(f"📦 Cache: {cache_key}")
+                    try:
+                        loaded = _rehydrate_dataframes(_loads_json(json_file), cache_path)
+                        _mem_put(cache_key, loaded, stored_at=json_file.stat().st_mtime)
+                        return loaded
+                    except Exception as e:
+                        print(f"⚠️ Error cargando cache, descargando nuevamente: {e}")
+                elif pickle_file.exists() and _fresh(pickle_file):
+                    print(f"📦 Cache: {cache_key}")
+                    try:
+                        loaded = _rehydrate_dataframes(_load_pickle(pickle_file), cache_path)
+                        _mem_put(cache_key, loaded, stored_at=pickle_file.stat().st_mtime)
+                        return loaded
+                    except Exception as e:
+                        print(f"⚠️ Error cargando cache, descargando nuevamente: {e}")
+
+                # Ejecutar función y guardar
+                print(f"🌐 Descarga: {cache_key}")
+                result = func(*args, **kwargs)
+
+                # Guardar si hay datos válidos. len(index) en lugar de
+                # .empty: la misma pregunta sin pasar por any() sobre
+                # los ejes, como hacen los internos de pandas
+                if result is None:
+                    should_cache = False
+                elif isinstance(result, pd.DataFrame):
+                    should_cache = len(result.index) > 0
                 elif isinstance(result, dict):
-                    should_cache = bool(result)  # True si el dict no está vacío
-                # Otros tipos (listas, etc.)
+                    should_cache = len(result) > 0
                 else:
                     should_cache = bool(result)
 
-            if should_cache:
-                try:
-                    with open(cache_file, 'wb') as f:
-                        pickle.dump(result, f)
-                    print(f"💾 Guardado: {cache_key}")
-                except Exception as e:
-                    print(f"⚠️ Error guardando cache: {e}")
+                if should_cache:
+                    _mem_put(cache_key, result)
+                    try:
+                        _write_cache(cache_path, cache_key, result)
+                        print(f"💾 Guardado: {cache_key}")
+                        # Tras escribir, recortar el cache en disco al
+                        # tope configurado (ANGBAND_CACHE_MAX_BYTES)
+                        _evict_if_needed(cache_path)
+                    except Exception as e:
+                        print(f"⚠️ Error guardando cache: {e}")
+
+                return result
 
-            return result
+        def cache_clear():
+            """Vaciar el nivel en memoria (convención de lru_cache)"""
+            _mem.clear()
+            _mem_total[0] = 0
 
+        wrapper.cache_clear = cache_clear
         return wrapper
 
-    return decorator
\ No newline at end of file
+    return decorator